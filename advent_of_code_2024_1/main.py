@@ -1,7 +1,25 @@
+import heapq
+import tempfile
+from array import array
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+
+
+def sort_in_place(values):
+    if isinstance(values, array):
+        np.frombuffer(values, dtype=np.int64).sort()  # Sorts the typed buffer itself without boxing ints
+    else:
+        values.sort()
+
+
 def list_pair_diff(lst1, lst2):
-    lst1.sort()
-    lst2.sort()
-    return sum([abs(x - y) for x, y in zip(lst1, lst2)])
+    sort_in_place(lst1)
+    sort_in_place(lst2)
+    if isinstance(lst1, array) and isinstance(lst2, array):
+        return int(np.abs(np.frombuffer(lst1, dtype=np.int64) - np.frombuffer(lst2, dtype=np.int64)).sum())
+    return sum(abs(x - y) for x, y in zip(lst1, lst2))
 
 
 def read_columns_to_lists(filename):
@@ -16,14 +34,73 @@ def read_columns_to_lists(filename):
     return lst1, lst2
 
 
+def iter_column_chunks(filename, chunk_size=1 << 24):
+    # Reads roughly chunk_size bytes of whole lines at a time, skipping lines without exactly two values
+    with open(filename, 'r') as file:
+        while True:
+            lines = file.readlines(chunk_size)
+            if not lines:
+                return
+            pairs = [values for values in map(str.split, lines) if len(values) == 2]
+            values = array('q', map(int, chain.from_iterable(pairs)))
+            yield values[0::2], values[1::2]
+
+
+def read_columns_to_arrays(filename):
+    lst1 = array('q')
+    lst2 = array('q')
+    for chunk1, chunk2 in iter_column_chunks(filename):
+        lst1.extend(chunk1)
+        lst2.extend(chunk2)
+    return lst1, lst2
+
+
+def write_sorted_run(values, directory=None):
+    run = tempfile.TemporaryFile(dir=directory)
+    sort_in_place(values)
+    values.tofile(run)
+    run.seek(0)
+    return run
+
+
+def read_sorted_run(run, buffer_size=1 << 16):
+    while True:
+        values = array('q')
+        try:
+            values.fromfile(run, buffer_size)
+        except EOFError:
+            pass  # The last buffer is short, the items that were read are still in values
+        if not values:
+            return
+        yield from values
+
+
+def external_list_pair_diff(filename, chunk_size=1 << 24, directory=None):
+    # Sorts each chunk of both columns into a temporary run file, then merges the runs lazily
+    runs1 = []
+    runs2 = []
+    try:
+        for chunk1, chunk2 in iter_column_chunks(filename, chunk_size):
+            runs1.append(write_sorted_run(chunk1, directory))
+            runs2.append(write_sorted_run(chunk2, directory))
+        merged1 = heapq.merge(*(read_sorted_run(run) for run in runs1))
+        merged2 = heapq.merge(*(read_sorted_run(run) for run in runs2))
+        return sum(abs(x - y) for x, y in zip(merged1, merged2))
+    finally:
+        for run in runs1 + runs2:
+            run.close()
+
+
+def build_count_index(lst):
+    return Counter(lst)
+
+
+def similarity_score_from_index(lst, count_index):
+    return sum(num * count_index[num] for num in lst)
+
+
 def similarity_score(lst1, lst2):
-    total_sum = 0
-    for num in lst1:
-        if num not in lst2:
-            continue
-        else:
-            total_sum += lst2.count(num) * num
-    return total_sum
+    return similarity_score_from_index(lst1, build_count_index(lst2))
 
 
 if __name__ == '__main__':
@@ -34,3 +111,7 @@ if __name__ == '__main__':
     lst1, lst2 = read_columns_to_lists('input.txt')
     print(list_pair_diff(lst1, lst2))
     print(similarity_score(lst1, lst2))
+
+    lst1, lst2 = read_columns_to_arrays('input.txt')
+    print(list_pair_diff(lst1, lst2))
+    print(external_list_pair_diff('input.txt', chunk_size=1 << 12))
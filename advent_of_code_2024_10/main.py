@@ -79,6 +79,38 @@ def sum_trails_ratings(grid, trail_heads):
     return total_score
 
 
+def sum_trails_layered(grid):
+    """
+    Compute the score and rating sums for all trailheads in one sweep from height 9 down to 0.
+    Ratings count distinct trails per cell; scores merge reachable peaks as int bitsets.
+    """
+    rows, cols = len(grid), len(grid[0])
+    heights = [height for row in grid for height in row]
+    layers = [[] for _ in range(10)]
+    for idx, height in enumerate(heights):
+        layers[height].append(idx)
+
+    peaks = [0] * len(heights)
+    ratings = [0] * len(heights)
+    for bit, idx in enumerate(layers[9]):
+        peaks[idx] = 1 << bit
+        ratings[idx] = 1
+
+    for height in range(8, -1, -1):
+        for idx in layers[height]:
+            x, y = divmod(idx, cols)
+            for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+                if 0 <= nx < rows and 0 <= ny < cols:
+                    neighbor = nx * cols + ny
+                    if heights[neighbor] == height + 1:
+                        peaks[idx] |= peaks[neighbor]
+                        ratings[idx] += ratings[neighbor]
+
+    total_score = sum(bin(peaks[idx]).count('1') for idx in layers[0])
+    total_rating = sum(ratings[idx] for idx in layers[0])
+    return total_score, total_rating
+
+
 if __name__ == '__main__':
     grid = load_grid_from_file('example_1.txt')
     trail_heads = get_trail_heads(grid)
@@ -103,3 +135,4 @@ if __name__ == '__main__':
     grid = load_grid_from_file('input.txt')
     trail_heads = get_trail_heads(grid)
     print(sum_trails_ratings(grid, trail_heads))
+    print(sum_trails_layered(grid))
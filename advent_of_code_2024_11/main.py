@@ -1,5 +1,16 @@
 import time
+from collections import OrderedDict
 from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+# Bound on cached levels of per-stone counts, whole levels are evicted least recently used first
+LEVEL_CACHE_SIZE = 64
+BLINK_CACHE_SIZE = 1 << 16
+level_cache = OrderedDict()
+closed_positions = {}
+level_transitions = None
 
 
 def load_input(filename):
@@ -27,8 +38,8 @@ def blink(stones):
     return new_stones
 
 
-# Function to simulate the stones' evolution for a given number of blinks
-def simulate_blinks(initial_stones, blinks):
+# Function to simulate the stones' evolution for a given number of blinks, optionally modulo mod
+def simulate_blinks(initial_stones, blinks, mod=None):
     stones = defaultdict(int)
 
     # Initializing the stones dictionary with the input values
@@ -38,9 +49,260 @@ def simulate_blinks(initial_stones, blinks):
     # Perform blinks
     for _ in range(blinks):
         stones = blink(stones)
+        if mod is not None:
+            stones = {number: count % mod for number, count in stones.items()}
 
     # Return the total number of stones
-    return sum(stones.values())
+    return sum(stones.values()) if mod is None else sum(stones.values()) % mod
+
+
+def split_digits(number):
+    """Split a number with an even digit count into its two halves, or return None."""
+    digits, power = 1, 10
+    while power <= number:
+        digits += 1
+        power *= 10
+    if digits % 2:
+        return None
+    return divmod(number, 10 ** (digits >> 1))
+
+
+@lru_cache(maxsize=BLINK_CACHE_SIZE)
+def blink_stone(number):
+    """Return the stones a single stone turns into after one blink."""
+    if number == 0:
+        return (1,)
+    halves = split_digits(number)
+    if halves is not None:
+        return halves
+    return (number * 2024,)
+
+
+def cover_stones(initial_stones):
+    """
+    Grow the shared closed set to cover the stones and return their positions in it.
+    Cached levels only hold counts for the old closed set, so they are dropped when it grows.
+    """
+    global level_transitions
+    if any(stone not in closed_positions for stone in initial_stones):
+        values = find_closed_set(list(closed_positions) + list(initial_stones))
+        closed_positions.update((number, i) for i, number in enumerate(values))
+        # Sorted by parent, so a step sums the counts of each value's children
+        parents, children, weights, _ = build_transitions(values)
+        order = np.argsort(parents, kind='stable')
+        parents, children, weights = parents[order], children[order], weights[order]
+        starts = np.flatnonzero(np.r_[True, parents[1:] != parents[:-1]])
+        level_transitions = (children, parents, weights, starts)
+        level_cache.clear()
+    return np.array([closed_positions[stone] for stone in initial_stones], dtype=np.int64)
+
+
+def cache_level(blinks, counts):
+    level_cache[blinks] = counts
+    level_cache.move_to_end(blinks)
+    if len(level_cache) > LEVEL_CACHE_SIZE:
+        level_cache.popitem(last=False)
+
+
+def count_stones_for_blinks(initial_stones, blink_counts):
+    """
+    Answer several blink counts for the same initial stones in one sweep.
+    A level holds, for every value of the closed set, the number of stones one such stone
+    becomes with that many blinks remaining. Each level is built from the one below and
+    cached, so a new blink count resumes from the highest cached level under it.
+
+    Returns:
+        dict: Keys are the requested blink counts, values are the total number of stones.
+    """
+    positions = cover_stones(initial_stones)
+    totals = {}
+    for blinks in sorted(set(blink_counts)):
+        counts = level_cache.get(blinks)
+        if counts is None:
+            level = max((level for level in level_cache if level < blinks), default=0)
+            counts = level_cache.get(level)
+            if counts is None:
+                counts = np.ones(len(closed_positions), dtype=object)
+            for level in range(level + 1, blinks + 1):
+                counts = step_counts(counts, level_transitions, None)
+                cache_level(level, counts)
+        cache_level(blinks, counts)
+        totals[blinks] = int(counts[positions].sum())
+    return totals
+
+
+def count_stones(number, blinks):
+    """Count the stones a single stone becomes after the given number of blinks."""
+    return count_stones_for_blinks([number], [blinks])[blinks]
+
+
+def find_closed_set(initial_stones):
+    """Return every stone value reachable from the initial stones, in discovery order."""
+    index = dict.fromkeys(initial_stones)
+    frontier = list(index)
+    while frontier:
+        new_frontier = []
+        for number in frontier:
+            for child in blink_stone(number):
+                if child not in index:
+                    index[child] = None
+                    new_frontier.append(child)
+        frontier = new_frontier
+    return list(index)
+
+
+def build_transitions(values):
+    """
+    Build the sparse transition matrix over the closed set from blink's rules.
+    Entry k says a stone of values[parents[k]] becomes weights[k] stones of values[children[k]].
+    Entries are sorted by child, and starts marks where each child's run begins.
+
+    Returns:
+        tuple: (parents, children, weights, starts) int64 arrays.
+    """
+    position = {number: i for i, number in enumerate(values)}
+    entries = sorted((position[child], i, count)
+                     for i, number in enumerate(values)
+                     for child, count in blink({number: 1}).items())
+    children, parents, weights = (np.array(column, dtype=np.int64) for column in zip(*entries))
+    starts = np.flatnonzero(np.r_[True, children[1:] != children[:-1]])
+    return parents, children, weights, starts
+
+
+def step_counts(counts, transitions, mod):
+    """Apply one blink to a count vector through the sparse transitions."""
+    parents, children, weights, starts = transitions
+    stepped = np.zeros_like(counts)
+    stepped[children[starts]] = np.add.reduceat(counts[parents] * weights, starts)
+    return stepped if mod is None else stepped % mod
+
+
+def is_prime(number):
+    """Miller-Rabin test, deterministic for every number below 3.3e24."""
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    if number < 2 or any(number % base == 0 for base in bases):
+        return number in bases
+    odd, twos = number - 1, 0
+    while odd % 2 == 0:
+        odd, twos = odd >> 1, twos + 1
+    for base in bases:
+        x = pow(base, odd, number)
+        if x == 1:
+            continue
+        for _ in range(twos):
+            if x == number - 1:
+                break
+            x = x * x % number
+        else:
+            return False
+    return True
+
+
+def mod_dot(a, b, mod):
+    """Dot product modulo mod, int64 operands are split into 16-bit halves so the sums cannot overflow."""
+    if a.dtype == object:
+        return int(np.dot(a, b)) % mod
+    return (int(np.dot(a, b >> 16)) % mod * 65536 + int(np.dot(a, b & 65535))) % mod
+
+
+def berlekamp_massey(sequence, mod):
+    """
+    Find the shortest linear recurrence a sequence satisfies modulo a prime.
+
+    Returns:
+        array: The connection polynomial c, with c[0] == 1 and sum(c[i] * sequence[n - i]) == 0.
+    """
+    current = previous = np.ones(1, dtype=sequence.dtype)
+    length, gap, scale = 0, 1, 1
+    for n in range(len(sequence)):
+        discrepancy = mod_dot(current, sequence[n::-1][:len(current)], mod)
+        if discrepancy:
+            factor = discrepancy * pow(scale, -1, mod) % mod
+            updated = np.zeros(max(len(current), gap + len(previous)), dtype=sequence.dtype)
+            updated[:len(current)] = current
+            updated[gap:gap + len(previous)] = (updated[gap:gap + len(previous)] - factor * previous) % mod
+            if 2 * length <= n:
+                length, previous, scale, gap = n + 1 - length, current, discrepancy, 0
+            current = updated
+        gap += 1
+    return current
+
+
+def pack_poly(poly, width):
+    return int.from_bytes(b''.join(coefficient.to_bytes(width, 'little') for coefficient in poly), 'little')
+
+
+def multiply_polys(a, b, mod):
+    """Multiply two polynomials with coefficients below mod through a single big integer product."""
+    width = (2 * (mod - 1).bit_length() + min(len(a), len(b)).bit_length() + 7) >> 3
+    product = (pack_poly(a, width) * pack_poly(b, width)).to_bytes(width * (len(a) + len(b) - 1), 'little')
+    return [int.from_bytes(product[i:i + width], 'little') % mod for i in range(0, len(product), width)]
+
+
+def nth_term(numerator, denominator, n, mod):
+    """
+    Return the n-th coefficient of numerator / denominator modulo mod, where denominator[0] == 1.
+    Multiplying both by denominator(-x) leaves an even denominator, so each step halves n.
+    """
+    while n and numerator:
+        flipped = [(mod - coefficient) % mod if i & 1 else coefficient for i, coefficient in enumerate(denominator)]
+        numerator = multiply_polys(numerator, flipped, mod)[n & 1::2]
+        denominator = multiply_polys(denominator, flipped, mod)[::2]
+        n >>= 1
+    return numerator[0] if numerator else 0
+
+
+def count_stones_by_squaring(initial_stones, blinks, mod=None):
+    """
+    Count the stones after a very large number of blinks over the closed set of reachable values.
+
+    Transitions are stored sparsely and applied one blink at a time, which costs one pass over
+    the few nonzeros per blink. With a prime modulus the totals follow a linear recurrence of
+    order at most len(closed set), so past 2 * len(closed set) blinks Berlekamp-Massey recovers
+    it from that many stepped totals, and the answer is read off its generating function with
+    log(blinks) polynomial squarings.
+
+    Args:
+        initial_stones: The stones before blinking.
+        blinks: The number of blinks.
+        mod: Modulus for the counts, or None for exact Python int counts. Moduli that are not
+            prime are always stepped.
+
+    Returns:
+        int: The number of stones, modulo mod when one is given.
+    """
+    values = find_closed_set(initial_stones)
+    if not values:
+        return 0
+    position = {number: i for i, number in enumerate(values)}
+    transitions = build_transitions(values)
+    size = len(values)
+    recurrence = mod is not None and blinks > 2 * size and is_prime(mod)
+
+    # Object arrays hold Python ints, so exact counts and huge moduli never overflow
+    dtype = object
+    if mod is not None and (mod - 1) * int(np.add.reduceat(transitions[2], transitions[3]).max()) < 2 ** 63:
+        dtype = np.int64
+    total_dtype = np.int64 if dtype is np.int64 and size * mod < 2 ** 63 else object
+    counts = np.zeros(size, dtype=dtype)
+    for stone in initial_stones:
+        counts[position[stone]] += 1
+
+    if not recurrence:
+        for _ in range(blinks):
+            counts = step_counts(counts, transitions, mod)
+        total = int(counts.sum()) if mod is None else int(counts.sum(dtype=total_dtype)) % mod
+        return total
+
+    totals = []
+    for _ in range(2 * size):
+        totals.append(int(counts.sum(dtype=total_dtype)) % mod)
+        counts = step_counts(counts, transitions, mod)
+    terms = np.array(totals, dtype=np.int64 if mod < 2 ** 31 and size < 2 ** 16 else object)
+    connection = berlekamp_massey(terms, mod).tolist()
+    order = len(connection) - 1
+    numerator = multiply_polys(totals[:order], connection, mod)[:order] if order else []
+    return nth_term(numerator, connection, blinks, mod)
 
 
 def time_function(func, *args):
@@ -61,3 +323,18 @@ if __name__ == '__main__':
 
     line = load_input('input.txt')
     print(time_function(simulate_blinks, line, 75))
+
+    line = load_input('input.txt')
+    totals = time_function(count_stones_for_blinks, line, range(1, 201))
+    print(totals[25], totals[75])
+
+    line = load_input('example_1.txt')
+    print(time_function(count_stones_by_squaring, line, 75))
+    print(time_function(count_stones_by_squaring, line, 10 ** 6, 2 ** 20 - 3))
+    expected = time_function(simulate_blinks, line, 10 ** 6, 10 ** 9 + 7)
+    assert time_function(count_stones_by_squaring, line, 10 ** 6, 10 ** 9 + 7) == expected
+
+    line = load_input('input.txt')
+    print(time_function(count_stones_by_squaring, line, 75))
+    print(time_function(count_stones_by_squaring, line, 75, 2 ** 20 - 3))
+    print(time_function(count_stones_by_squaring, line, 10 ** 6, 1000003))
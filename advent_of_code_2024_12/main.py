@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def load_grid_from_file(filename):
     """Load grid data from a file into a 2D list."""
     with open(filename, 'r') as file:
@@ -115,6 +118,140 @@ def calculate_total_price(grid):
     return total_price
 
 
+def find_root(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]  # Path halving
+        i = parent[i]
+    return i
+
+
+def label_regions(grid):
+    """
+    Label regions with a single scanline union-find pass over a flat array, collecting
+    area, perimeter and corner (side) counts per cell on the way.
+
+    Returns:
+        dict: Keys are region roots, values are [area, perimeter, sides].
+    """
+    rows, cols = len(grid), len(grid[0])
+    plants = [plant for row in grid for plant in row]
+    parent = list(range(rows * cols))
+    perimeters = [0] * (rows * cols)
+    corners = [0] * (rows * cols)
+
+    def same(r, c, plant):
+        return 0 <= r < rows and 0 <= c < cols and plants[r * cols + c] == plant
+
+    for r in range(rows):
+        for c in range(cols):
+            i = r * cols + c
+            plant = plants[i]
+            up, down = same(r - 1, c, plant), same(r + 1, c, plant)
+            left, right = same(r, c - 1, plant), same(r, c + 1, plant)
+            if up:
+                parent[find_root(parent, i)] = find_root(parent, i - cols)
+            if left:
+                parent[find_root(parent, i)] = find_root(parent, i - 1)
+
+            perimeters[i] = 4 - up - down - left - right
+            # Convex corners have both orthogonal neighbours outside the region,
+            # concave ones both inside with the diagonal between them outside
+            corners[i] = ((not up and not left) + (not up and not right) +
+                          (not down and not left) + (not down and not right) +
+                          (up and left and not same(r - 1, c - 1, plant)) +
+                          (up and right and not same(r - 1, c + 1, plant)) +
+                          (down and left and not same(r + 1, c - 1, plant)) +
+                          (down and right and not same(r + 1, c + 1, plant)))
+
+    regions = {}
+    for i in range(rows * cols):
+        region = regions.setdefault(find_root(parent, i), [0, 0, 0])
+        region[0] += 1
+        region[1] += perimeters[i]
+        region[2] += corners[i]
+    return regions
+
+
+def calculate_prices(grid):
+    """Return the fencing cost and the bulk discount price from one labelling pass."""
+    regions = label_regions(grid).values()
+    return (sum(area * perimeter for area, perimeter, _ in regions),
+            sum(area * sides for area, _, sides in regions))
+
+
+def load_grid_array(filename):
+    """Load grid data from a file into a 2D uint8 array."""
+    with open(filename, 'r') as file:
+        lines = file.read().split()
+    return np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1)
+
+
+def label_regions_array(plants):
+    """
+    Label regions by hooking the larger label of every same-plant edge onto the smaller one
+    and pointer jumping until each cell holds its root. Labels are flat cell indices.
+    """
+    rows, cols = plants.shape
+    index = np.arange(rows * cols).reshape(rows, cols)
+    horizontal = plants[:, 1:] == plants[:, :-1]
+    vertical = plants[1:, :] == plants[:-1, :]
+    a = np.concatenate([index[:, :-1][horizontal], index[:-1, :][vertical]])
+    b = np.concatenate([index[:, 1:][horizontal], index[1:, :][vertical]])
+
+    labels = np.arange(rows * cols)
+    while True:
+        la, lb = labels[a], labels[b]
+        differ = la != lb
+        if not differ.any():
+            return labels.reshape(rows, cols)
+        np.minimum.at(labels, np.maximum(la[differ], lb[differ]), np.minimum(la[differ], lb[differ]))
+        while True:
+            jumped = labels[labels]
+            if (jumped == labels).all():
+                break
+            labels = jumped
+
+
+def count_sides_array(labels):
+    """
+    Count corners (which equal sides) per label by sliding a 2x2 window over the padded labels.
+    Each window is a vertex shared by four cells: a cell has a convex corner there when both
+    its orthogonal window neighbours differ, and a concave one when both match but the diagonal does not.
+    """
+    padded = np.pad(labels, 1, constant_values=-1)
+    top_left, top_right = padded[:-1, :-1], padded[:-1, 1:]
+    bottom_left, bottom_right = padded[1:, :-1], padded[1:, 1:]
+    sides = np.zeros(labels.size, dtype=np.int64)
+    # (owner, horizontal neighbour, vertical neighbour, diagonal neighbour) within the window
+    for owner, horizontal, vertical, diagonal in ((top_left, top_right, bottom_left, bottom_right),
+                                                  (top_right, top_left, bottom_right, bottom_left),
+                                                  (bottom_left, bottom_right, top_left, top_right),
+                                                  (bottom_right, bottom_left, top_right, top_left)):
+        convex = (horizontal != owner) & (vertical != owner)
+        concave = (horizontal == owner) & (vertical == owner) & (diagonal != owner)
+        corner = (convex | concave) & (owner >= 0)
+        sides += np.bincount(owner[corner], minlength=labels.size)
+    return sides
+
+
+def calculate_prices_array(plants):
+    """Return the fencing cost and the bulk discount price using array operations only."""
+    labels = label_regions_array(plants)
+    flat = labels.ravel()
+    areas = np.bincount(flat, minlength=labels.size)
+
+    padded = np.pad(labels, 1, constant_values=-1)
+    perimeters = np.zeros(labels.size, dtype=np.int64)
+    for first, second in ((padded[:, :-1], padded[:, 1:]), (padded[:-1, :], padded[1:, :])):
+        boundary = first != second
+        for side in (first, second):
+            inside = boundary & (side >= 0)
+            perimeters += np.bincount(side[inside], minlength=labels.size)
+
+    sides = count_sides_array(labels)
+    return int(areas @ perimeters), int(areas @ sides)
+
+
 if __name__ == '__main__':
     grid = load_grid_from_file('example_1.txt')
     print(calculate_fencing_cost(grid))
@@ -142,3 +279,5 @@ if __name__ == '__main__':
 
     grid = load_grid_from_file('input.txt')
     print(calculate_total_price(grid))
+    print(calculate_prices(grid))
+    print(calculate_prices_array(load_grid_array('input.txt')))
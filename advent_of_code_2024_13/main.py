@@ -1,3 +1,15 @@
+import re
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+MACHINE_PATTERN = re.compile(r"-?\d+")
+PRIZE_OFFSET = 10000000000000
+# Bound on cached button pair factorisations, the least recently used ones are evicted first
+BUTTON_CACHE_SIZE = 1 << 16
+
+
 def parse_input(file_path):
     """Parse the input file and return a list of machines."""
     machines = []
@@ -36,37 +48,119 @@ def parse_input(file_path):
     return machines
 
 
-def solve_claw_machine(xa, ya, xb, yb, xp, yp):
+def extended_gcd(a, b):
+    """Return (g, x, y) with a * x + b * y == g, where g is the non-negative gcd of a and b."""
+    old_r, r, old_x, x, old_y, y = a, b, 1, 0, 0, 1
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    if old_r < 0:
+        return -old_r, -old_x, -old_y
+    return old_r, old_x, old_y
+
+
+@lru_cache(maxsize=BUTTON_CACHE_SIZE)
+def prepare_buttons(xa, ya, xb, yb):
     """
-    Solve the claw machine system of equations:
-    xa * a + xb * b = xp
-    ya * a + yb * b = yp
-    Return the minimum cost if possible, otherwise return 0 if the solution is invalid.
+    Factorise a button pair once so any prize can then be solved with a few integer operations.
+
+    Returns:
+    tuple: ('unique', xa, ya, xb, yb, det) for independent buttons,
+    ('line', dx, dy, alpha, beta, g, x, y) for collinear buttons where A = alpha * d,
+    B = beta * d for the primitive direction d = (dx, dy) and alpha * x + beta * y == g,
+    or ('still',) when neither button moves the claw.
     """
-    # Calculate the determinant to check for solvability
     det = xa * yb - xb * ya
-    if det == 0:
-        # No unique solution (either no solution or infinitely many solutions)
+    if det:
+        return 'unique', xa, ya, xb, yb, det
+
+    vx, vy = (xa, ya) if (xa, ya) != (0, 0) else (xb, yb)
+    if (vx, vy) == (0, 0):
+        return 'still',
+    step = gcd(vx, vy)
+    dx, dy = vx // step, vy // step
+    alpha = xa // dx if dx else ya // dy
+    beta = xb // dx if dx else yb // dy
+    return ('line', dx, dy, alpha, beta) + extended_gcd(alpha, beta)
+
+
+def solve_line(setup, xp, yp):
+    """
+    Minimise 3 * a + b over the non-negative solutions of alpha * a + beta * b = pi,
+    where the prize is pi * d. Solutions are a = a0 + p * t, b = b0 - q * t and the
+    cost is linear in t, so the optimum is at one end of the feasible range of t.
+    """
+    _, dx, dy, alpha, beta, g, x, y = setup
+    if dx * yp - dy * xp:
+        return 0  # The prize is not on the line the claw can move along
+    pi = xp // dx if dx else yp // dy
+    if pi % g:
+        return 0
+
+    a0, b0 = x * (pi // g), y * (pi // g)
+    p, q = beta // g, alpha // g
+    low, high = float('-inf'), float('inf')
+    for start, slope in ((a0, p), (b0, -q)):
+        if slope > 0:
+            low = max(low, -(start // slope))
+        elif slope < 0:
+            high = min(high, start // -slope)
+        elif start < 0:
+            return 0
+    if low > high:
         return 0
 
-    # Calculate potential solutions for `a` and `b`
-    try:
-        sol_a = (xp * yb - yp * xb) / det
-        sol_b = (yp * xa - xp * ya) / det
-    except ZeroDivisionError:
+    rate = 3 * p - q
+    t = low if rate > 0 or (rate == 0 and low != float('-inf')) else high
+    return 3 * (a0 + p * t) + (b0 - q * t)
+
+
+def solve_prize(setup, xp, yp):
+    """Return the minimum cost to win the prize for a prepared button pair, or 0."""
+    if setup[0] == 'still':
         return 0
+    if setup[0] == 'line':
+        return solve_line(setup, xp, yp)
+
+    _, xa, ya, xb, yb, det = setup
+    # Calculate potential solutions for `a` and `b` with exact integer division
+    sol_a, rem_a = divmod(xp * yb - yp * xb, det)
+    sol_b, rem_b = divmod(yp * xa - xp * ya, det)
 
     # Ensure solutions are integers and non-negative
-    if sol_a.is_integer() and sol_b.is_integer():
-        sol_a, sol_b = int(sol_a), int(sol_b)
-        if sol_a >= 0 and sol_b >= 0:
-            # Calculate the cost: A costs 3 tokens, B costs 1 token
-            return 3 * sol_a + sol_b
+    if rem_a == 0 and rem_b == 0 and sol_a >= 0 and sol_b >= 0:
+        # Calculate the cost: A costs 3 tokens, B costs 1 token
+        return 3 * sol_a + sol_b
 
     # If solutions are not valid
     return 0
 
 
+def solve_claw_machine_offsets(xa, ya, xb, yb, xp, yp, offsets):
+    """
+    Solve one machine for several prize offsets, each added to both prize coordinates.
+    The button pair is prepared once and cached, so repeated machines skip the setup.
+
+    Returns:
+    list: The minimum cost per offset, 0 where the prize cannot be won.
+    """
+    setup = prepare_buttons(xa, ya, xb, yb)
+    return [solve_prize(setup, xp + offset, yp + offset) for offset in offsets]
+
+
+def solve_claw_machine(xa, ya, xb, yb, xp, yp):
+    """
+    Solve the claw machine system of equations:
+    xa * a + xb * b = xp
+    ya * a + yb * b = yp
+    Return the minimum cost if possible, otherwise return 0 if the solution is invalid.
+    Collinear buttons are solved by minimising the cost along their shared line.
+    """
+    return solve_prize(prepare_buttons(xa, ya, xb, yb), xp, yp)
+
+
 def calculate_total_cost(file_path):
     """Calculate the total minimum cost to win as many prizes as possible."""
     machines = parse_input(file_path)
@@ -88,7 +182,7 @@ def calculate_total_cost_extended(file_path):
     prizes_won = 0
 
     for (xa, ya), (xb, yb), (xp, yp) in machines:
-        cost = solve_claw_machine(xa, ya, xb, yb, xp+10000000000000, yp+10000000000000)
+        cost = solve_claw_machine(xa, ya, xb, yb, xp + PRIZE_OFFSET, yp + PRIZE_OFFSET)
         if cost != 0:
             total_cost += cost
             prizes_won += 1
@@ -96,6 +190,50 @@ def calculate_total_cost_extended(file_path):
     return prizes_won, total_cost
 
 
+def parse_input_array(file_path):
+    """Parse every machine with one regex pass into an (n, 6) array of xa, ya, xb, yb, xp, yp."""
+    with open(file_path, 'r') as f:
+        numbers = [int(number) for number in MACHINE_PATTERN.findall(f.read())]
+    machines = np.array(numbers, dtype=object).reshape(-1, 6)
+    # Use int64 when every product and cost in the solver fits, otherwise keep exact Python ints
+    buttons = max((abs(number) for number in machines[:, :4].ravel()), default=0)
+    prizes = max((abs(number) for number in machines[:, 4:].ravel()), default=0) + PRIZE_OFFSET
+    return machines.astype(np.int64) if 8 * buttons * max(buttons, prizes) < 2 ** 63 else machines
+
+
+def solve_claw_machines(machines, offsets=(0,)):
+    """
+    Solve all machines for several prize offsets at once with exact integer division.
+    The determinant and numerators are computed once, each offset only adds its prize terms.
+
+    Returns:
+    array: The minimum cost per offset and machine, 0 where the prize cannot be won.
+    """
+    xa, ya, xb, yb, xp, yp = machines.T
+    offsets = np.array(offsets, dtype=machines.dtype)[:, None]
+    det = xa * yb - xb * ya
+    solvable = det != 0
+    safe_det = np.where(solvable, det, 1)
+    num_a = xp * yb - yp * xb + offsets * (yb - xb)
+    num_b = yp * xa - xp * ya + offsets * (xa - ya)
+    # Floor division and remainder rather than np.divmod, which object arrays do not support
+    sol_a, rem_a = num_a // safe_det, num_a % safe_det
+    sol_b, rem_b = num_b // safe_det, num_b % safe_det
+    valid = solvable & (rem_a == 0) & (rem_b == 0) & (sol_a >= 0) & (sol_b >= 0)
+    costs = np.where(valid, 3 * sol_a + sol_b, 0)
+    # Collinear buttons are rare, so they go through the scalar engine
+    for i in np.flatnonzero(~solvable):
+        machine = (int(value) for value in machines[i])
+        costs[:, i] = solve_claw_machine_offsets(*machine, [int(offset) for offset in offsets[:, 0]])
+    return costs
+
+
+def calculate_total_costs_batched(file_path):
+    """Calculate (prizes won, total cost) for both parts from one parse."""
+    costs = solve_claw_machines(parse_input_array(file_path), (0, PRIZE_OFFSET))
+    return [(int(np.count_nonzero(part)), int(part.sum(dtype=object))) for part in costs]
+
+
 # Example usage
 if __name__ == "__main__":
     input_file = "example_1.txt"
@@ -112,4 +250,8 @@ if __name__ == "__main__":
 
     input_file = "input.txt"
     prizes, cost = calculate_total_cost_extended(input_file)
-    print(f"Prizes won: {prizes}, Total cost: {cost}")
\ No newline at end of file
+    print(f"Prizes won: {prizes}, Total cost: {cost}")
+
+    for input_file in ("example_1.txt", "input.txt"):
+        for prizes, cost in calculate_total_costs_batched(input_file):
+            print(f"Prizes won: {prizes}, Total cost: {cost}")
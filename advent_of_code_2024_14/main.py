@@ -1,3 +1,10 @@
+import re
+
+import numpy as np
+
+ROBOT_PATTERN = re.compile(r"-?\d+")
+
+
 def parse_input(file_path):
     """Parse the input file and return a dictionary of robot positions and speeds."""
     robots = []
@@ -52,6 +59,59 @@ def count_robots_in_quadrants(robots, grid_size, steps):
     return quadrants[0] * quadrants[1] * quadrants[2] * quadrants[3]
 
 
+def parse_input_arrays(file_path):
+    """Parse the input file with one regex pass into x, y, dx, dy int64 arrays."""
+    with open(file_path, 'r') as f:
+        numbers = np.array(ROBOT_PATTERN.findall(f.read()), dtype=np.int64).reshape(-1, 4)
+    return tuple(np.ascontiguousarray(column) for column in numbers.T)
+
+
+def quadrant_codes(robots, grid_size, steps):
+    """
+    Return the quadrant (0-3) of every robot after 'steps' iterations, or -1 on a mid-line.
+    """
+    x, y, dx, dy = robots
+    width, height = grid_size
+    mid_x, mid_y = width // 2, height // 2
+    final_x = (x + dx * steps) % width
+    final_y = (y + dy * steps) % height
+    codes = (final_x > mid_x) + 2 * (final_y > mid_y)
+    return np.where((final_x == mid_x) | (final_y == mid_y), -1, codes)
+
+
+def count_robots_in_quadrants_arrays(robots, grid_size, steps):
+    """Calculate the safety factor from robot arrays with a single bincount."""
+    codes = quadrant_codes(robots, grid_size, steps)
+    quadrants = np.bincount(codes[codes >= 0], minlength=4)
+    return int(np.prod(quadrants.astype(object)))
+
+
+def safety_factors(robots, grid_size, steps, chunk_cells=1 << 24):
+    """
+    Calculate the safety factor for every value in 'steps' at once.
+
+    Parameters:
+    robots (tuple): The x, y, dx, dy arrays from parse_input_arrays.
+    grid_size (tuple): The size of the grid (width, height).
+    steps (iterable): The step values to evaluate.
+    chunk_cells (int): Upper bound on robots times steps evaluated in one array operation.
+
+    Returns:
+    list: The safety factor for each step value, in order.
+    """
+    steps = np.asarray(list(steps), dtype=np.int64)
+    chunk = max(1, chunk_cells // max(1, len(robots[0])))
+    factors = []
+    for start in range(0, len(steps), chunk):
+        block = steps[start:start + chunk]
+        codes = quadrant_codes(robots, grid_size, block[:, None])
+        # Offset every step's quadrants so one bincount covers the whole block
+        keys = (codes + 4 * np.arange(len(block))[:, None])[codes >= 0]
+        quadrants = np.bincount(keys, minlength=4 * len(block)).reshape(-1, 4)
+        factors.extend(int(factor) for factor in np.prod(quadrants.astype(object), axis=1))
+    return factors
+
+
 from statistics import variance as var
 
 
@@ -85,3 +145,8 @@ if __name__ == "__main__":
     grid_size = (101, 103)
     steps = 100  # Number of steps to simulate
     print(f"Time to find the tree: {find_tree(*grid_size, robots)}")
+
+    robots = parse_input_arrays(input_file)
+    print(f"Safety factor after {steps} seconds: {count_robots_in_quadrants_arrays(robots, grid_size, steps)}")
+    factors = safety_factors(robots, grid_size, range(101 * 103))
+    print(f"Step with the lowest safety factor: {int(np.argmin(factors))}")
@@ -1,3 +1,9 @@
+from collections import defaultdict
+from collections import deque
+
+import numpy as np
+
+
 def is_increasing(lst):
     return all(1 <= lst[i] - lst[i - 1] <= 3 for i in range(1, len(lst)))
 
@@ -10,18 +16,82 @@ def is_almost_increasing(lst):
     return True
 
 
+def is_safe(lst):
+    increasing = decreasing = True
+    for i in range(1, len(lst)):
+        diff = lst[i] - lst[i - 1]
+        increasing = increasing and 1 <= diff <= 3
+        decreasing = decreasing and -3 <= diff <= -1
+        if not (increasing or decreasing):
+            return False
+    return True
+
+
+def is_safe_with_tolerance(lst, k=1):
+    # For each of the last k + 1 levels keep the fewest removals needed if it is the latest kept level
+    window = deque(maxlen=k + 1)
+    for i, level in enumerate(lst):
+        best_inc = best_dec = i if i <= k else k + 1  # Drop every level before this one
+        for skipped, (prev, inc, dec) in enumerate(reversed(window)):
+            if 1 <= level - prev <= 3 and inc + skipped < best_inc:
+                best_inc = inc + skipped
+            if 1 <= prev - level <= 3 and dec + skipped < best_dec:
+                best_dec = dec + skipped
+        window.append((level, best_inc, best_dec))
+
+    if not window:
+        return True
+    # Every level after the latest kept one is removed as well
+    return any(min(inc, dec) + trailing <= k for trailing, (_, inc, dec) in enumerate(reversed(window)))
+
+
+def is_safe_dampened(lst):
+    return is_safe_with_tolerance(lst, 1)
+
+
+def read_reports(filename):
+    with open(filename, 'r') as file:
+        return [list(map(int, line.split())) for line in file if line.strip()]
+
+
+def safe_rows(levels):
+    diffs = np.diff(levels, axis=1)
+    increasing = ((diffs >= 1) & (diffs <= 3)).all(axis=1)
+    decreasing = ((diffs >= -3) & (diffs <= -1)).all(axis=1)
+    return increasing | decreasing
+
+
+def count_safe_reports_batched(reports):
+    # Reports of equal length share one 2D array so every check runs over whole columns at once
+    groups = defaultdict(list)
+    for report in reports:
+        groups[len(report)].append(report)
+
+    safe_count = 0
+    safe_count_with_one_bad = 0
+    for length, rows in groups.items():
+        levels = np.array(rows, dtype=np.int64).reshape(len(rows), length)
+        strict = safe_rows(levels)
+        dampened = strict.copy()
+        for i in range(length):
+            dampened |= safe_rows(np.delete(levels, i, axis=1))
+        safe_count += int(np.count_nonzero(strict))
+        safe_count_with_one_bad += int(np.count_nonzero(dampened))
+    return safe_count, safe_count_with_one_bad
+
+
 if __name__ == '__main__':
     safe_list_count = 0
     safe_list_count_with_one_bad = 0
     with open('input.txt', 'r') as file:
         for line in file:
             numbers = list(map(int, line.split()))
-            if numbers[-1] < numbers[0]:
-                numbers.reverse()
-            if is_increasing(numbers):
+            if is_safe(numbers):
                 safe_list_count += 1
                 safe_list_count_with_one_bad += 1
-            elif is_almost_increasing(numbers):
+            elif is_safe_dampened(numbers):
                 safe_list_count_with_one_bad += 1
     print(safe_list_count)  # Output the count of safe lists
     print(safe_list_count_with_one_bad)  # Output the count of safe lists with one bad element
+
+    print(count_safe_reports_batched(read_reports('input.txt')))  # Both counts in one batched pass
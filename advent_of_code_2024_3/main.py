@@ -1,4 +1,11 @@
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+MUL_DO_DONT_PATTERN = re.compile(rb"do\(\)|don't\(\)|mul\((\d+),(\d+)\)")
+# Any unfinished prefix of one of the tokens above, used to detect tokens cut at a chunk edge
+PARTIAL_TOKEN_PATTERN = re.compile(rb"m(?:u(?:l(?:\(\d*(?:,\d*)?)?)?)?|d(?:o(?:\(|n(?:'(?:t\(?)?)?)?)?")
 
 
 def find_mul_expressions(file_path):
@@ -42,6 +49,94 @@ def calc_mul_expression(expressions):
     return total_sum
 
 
+def partial_token_suffix(buffer, last_end):
+    # Tokens only contain 'm' or 'd' as their first byte, so a cut token must start at the last one
+    start = max(buffer.rfind(b'm'), buffer.rfind(b'd'))
+    if start < last_end or not PARTIAL_TOKEN_PATTERN.fullmatch(buffer, start):
+        return b''
+    return buffer[start:]
+
+
+def scan_memory_dump(file_path, chunk_size=1 << 24):
+    total_sum = 0
+    enabled_sum = 0
+    flag = True
+    carry = b''
+    if os.path.getsize(file_path) == 0:
+        return total_sum, enabled_sum  # An empty file cannot be memory-mapped
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        for offset in range(0, len(memory), chunk_size):
+            buffer = carry + memory[offset:offset + chunk_size]
+            last_end = 0
+            for match in MUL_DO_DONT_PATTERN.finditer(buffer):
+                token = match.group()
+                if token == b"do()":
+                    flag = True
+                elif token == b"don't()":
+                    flag = False
+                else:
+                    product = int(match.group(1)) * int(match.group(2))
+                    total_sum += product
+                    if flag:
+                        enabled_sum += product
+                last_end = match.end()
+            carry = partial_token_suffix(buffer, last_end)
+    return total_sum, enabled_sum
+
+
+def next_token_boundary(memory, position):
+    # A position holding 'm' or 'd' can never be inside a token, so chunks may be cut there safely
+    candidates = [index for index in (memory.find(b'm', position), memory.find(b'd', position)) if index != -1]
+    return min(candidates, default=len(memory))
+
+
+def summarize_chunk(file_path, start, end):
+    total_sum = 0
+    sum_if_enabled = 0
+    sum_if_disabled = 0
+    flag_if_enabled = True
+    flag_if_disabled = False
+    final_flag = None  # Stays None when the chunk has no do()/don't() and just passes the state through
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        for match in MUL_DO_DONT_PATTERN.finditer(memory, start, end):  # Scans the mapping in place
+            token = match.group()
+            if token == b"do()":
+                flag_if_enabled = flag_if_disabled = final_flag = True
+            elif token == b"don't()":
+                flag_if_enabled = flag_if_disabled = final_flag = False
+            else:
+                product = int(match.group(1)) * int(match.group(2))
+                total_sum += product
+                if flag_if_enabled:
+                    sum_if_enabled += product
+                if flag_if_disabled:
+                    sum_if_disabled += product
+    return total_sum, sum_if_enabled, sum_if_disabled, final_flag
+
+
+def scan_memory_dump_parallel(file_path, workers=None):
+    workers = workers or os.cpu_count()
+    if os.path.getsize(file_path) == 0:
+        return 0, 0  # An empty file cannot be memory-mapped
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        size = len(memory)
+        boundaries = sorted({0, size} | {next_token_boundary(memory, i * size // workers) for i in range(1, workers)})
+
+    starts, ends = boundaries[:-1], boundaries[1:]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        summaries = executor.map(summarize_chunk, [file_path] * len(starts), starts, ends)
+
+        total_sum = 0
+        enabled_sum = 0
+        flag = True
+        for chunk_total, sum_if_enabled, sum_if_disabled, final_flag in summaries:
+            total_sum += chunk_total
+            enabled_sum += sum_if_enabled if flag else sum_if_disabled
+            if final_flag is not None:
+                flag = final_flag
+    return total_sum, enabled_sum
+
+
 if __name__ == '__main__':
     file_path = 'input.txt'
     mul_expressions = find_mul_expressions(file_path)
@@ -51,4 +146,5 @@ if __name__ == '__main__':
     print(total_sum)
     expressions = find_mul_do_dont_expressions(file_path)
     print(calc_mul_expression(expressions))
-
+    print(scan_memory_dump(file_path))  # Both sums in a single streaming pass
+    print(scan_memory_dump_parallel(file_path))  # Same sums with the chunks spread over a process pool
@@ -1,3 +1,10 @@
+from collections import deque
+
+import numpy as np
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+
+
 def find_all_occurrences(grid, target):
     def count_word_in_direction(x, y, dx, dy):
         for i in range(len(target)):  # Check if the word matches in the given direction
@@ -75,6 +82,133 @@ def find_xmas_patterns(grid):
     return count
 
 
+def load_grid_array(filename):
+    with open(filename, 'r') as file:
+        lines = file.read().split()
+    return np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1)
+
+
+def start_range(size, step, span):
+    # Start indices along one axis for which the whole word stays inside the grid
+    return (0, size - span * step) if step >= 0 else (-span * step, size)
+
+
+def count_word_array(grid, target):
+    """
+    Count occurrences of target in all 8 directions by comparing shifted views of the grid.
+    Each letter narrows a boolean mask of candidate start cells, so no per-cell Python code runs.
+    """
+    height, width = grid.shape
+    span = len(target) - 1
+    letters = np.frombuffer(target.encode(), dtype=np.uint8)
+    count = 0
+    for dx, dy in DIRECTIONS:
+        x0, x1 = start_range(height, dx, span)
+        y0, y1 = start_range(width, dy, span)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        mask = np.ones((x1 - x0, y1 - y0), dtype=bool)
+        for i, letter in enumerate(letters):
+            mask &= grid[x0 + i * dx:x1 + i * dx, y0 + i * dy:y1 + i * dy] == letter
+        count += int(np.count_nonzero(mask))
+    return count
+
+
+def find_xmas_patterns_array(grid):
+    """
+    Count X-MAS patterns with a 3x3 kernel: an 'A' center and both diagonals reading MAS either way.
+    """
+    m, s = ord('M'), ord('S')
+    center = grid[1:-1, 1:-1] == ord('A')
+    top_left, top_right = grid[:-2, :-2], grid[:-2, 2:]
+    bottom_left, bottom_right = grid[2:, :-2], grid[2:, 2:]
+    diagonal = ((top_left == m) & (bottom_right == s)) | ((top_left == s) & (bottom_right == m))
+    anti_diagonal = ((top_right == m) & (bottom_left == s)) | ((top_right == s) & (bottom_left == m))
+    return int(np.count_nonzero(center & diagonal & anti_diagonal))
+
+
+def build_automaton(patterns):
+    """
+    Build an Aho-Corasick automaton as parallel lists indexed by node: goto tables,
+    failure links and the indices of the patterns that end at each node.
+    """
+    goto, fail, output = [{}], [0], [[]]
+    for index, pattern in enumerate(patterns):
+        node = 0
+        for char in pattern:
+            if char not in goto[node]:
+                goto[node][char] = len(goto)
+                goto.append({})
+                fail.append(0)
+                output.append([])
+            node = goto[node][char]
+        output[node].append(index)
+
+    queue = deque(goto[0].values())  # Children of the root keep their failure link to the root
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            queue.append(child)
+            state = fail[node]
+            while state and char not in goto[state]:
+                state = fail[state]
+            fail[child] = goto[state].get(char, 0)
+            output[child].extend(output[fail[child]])
+    return goto, fail, output
+
+
+def search_automaton(automaton, text):
+    """Yield (pattern index, end index) for every pattern occurrence in text."""
+    goto, fail, output = automaton
+    node = 0
+    for end, char in enumerate(text):
+        while node and char not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(char, 0)
+        for index in output[node]:
+            yield index, end
+
+
+def grid_lines(grid):
+    """Yield (x, y, dx, dy, line) for every row, column, diagonal and anti-diagonal of the grid."""
+    height, width = len(grid), len(grid[0])
+    starts = ([(x, 0, 0, 1) for x in range(height)] + [(0, y, 1, 0) for y in range(width)] +
+              [(x, 0, 1, 1) for x in range(height)] + [(0, y, 1, 1) for y in range(1, width)] +
+              [(x, width - 1, 1, -1) for x in range(height)] + [(0, y, 1, -1) for y in range(width - 1)])
+    for x, y, dx, dy in starts:
+        chars = []
+        cx, cy = x, y
+        while 0 <= cx < height and 0 <= cy < width:
+            chars.append(grid[cx][cy])
+            cx, cy = cx + dx, cy + dy
+        yield x, y, dx, dy, ''.join(chars)
+
+
+def search_words(grid, words):
+    """
+    Find every word in all 8 directions with a single pass of one automaton over the grid lines.
+    Each line is only read forwards, so reversed words are added to the automaton for the
+    other 4 directions.
+
+    Returns:
+    tuple: (counts, positions) where counts maps each word to its number of occurrences and
+    positions maps it to a list of (x, y, dx, dy) for the first letter and reading direction.
+    """
+    words = [word for word in dict.fromkeys(words) if word]
+    automaton = build_automaton(words + [word[::-1] for word in words])
+    positions = {word: [] for word in words}
+    for x, y, dx, dy, line in grid_lines(grid):
+        for index, end in search_automaton(automaton, line):
+            word = words[index % len(words)]
+            if index < len(words):
+                start = end - len(word) + 1
+                positions[word].append((x + start * dx, y + start * dy, dx, dy))
+            else:
+                positions[word].append((x + end * dx, y + end * dy, -dx, -dy))
+    counts = {word: len(found) for word, found in positions.items()}
+    return counts, positions
+
+
 if __name__ == '__main__':
     grid = load_grid_from_file('example_1.txt')
     target_word = "XMAS"
@@ -101,3 +235,10 @@ if __name__ == '__main__':
     grid = load_grid_from_file(file_path)
     occurrences = find_xmas_patterns(grid)
     print(f"Number of X-MAS patterns in input:", occurrences)
+
+    grid = load_grid_array(file_path)
+    print(f"Number of occurrences in input of '{target_word}' (vectorized):", count_word_array(grid, target_word))
+    print(f"Number of X-MAS patterns in input (vectorized):", find_xmas_patterns_array(grid))
+
+    counts, positions = search_words(load_grid_from_file(file_path), [target_word, "MAS", "SAM"])
+    print("Occurrences of each word in input (automaton):", counts)
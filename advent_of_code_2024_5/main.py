@@ -1,3 +1,9 @@
+from collections import defaultdict
+from collections import deque
+
+NO_PAGES = frozenset()
+
+
 def parse_input(input_str):
     with open(input_str) as f:
         input_str = f.read()
@@ -56,7 +62,148 @@ def calculate_middle_sum(input_str):
     return middle_sum, incorrect_sum
 
 
+def build_rule_index(rules):
+    # Map every page to the set of pages that must come after it
+    successors = defaultdict(set)
+    for A, B in rules:
+        successors[A].add(B)
+    return successors
+
+
+def is_update_valid_indexed(update, successors):
+    # Valid when no page has to come before one of the pages already seen
+    seen = set()
+    for page in update:
+        if not seen.isdisjoint(successors.get(page, NO_PAGES)):
+            return False
+        seen.add(page)
+    return True
+
+
+def reorganize_indexed(update, successors):
+    # Kahn's topological sort restricted to the pages of this update
+    pages = set(update)
+    edges = {page: successors.get(page, NO_PAGES) & pages for page in update}
+    in_degree = dict.fromkeys(update, 0)
+    for page in update:
+        for successor in edges[page]:
+            in_degree[successor] += 1
+
+    queue = deque(page for page in update if in_degree[page] == 0)
+    sorted_update = []
+    while queue:
+        page = queue.popleft()
+        sorted_update.append(page)
+        for successor in edges[page]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                queue.append(successor)
+    return sorted_update
+
+
+def calculate_middle_sum_indexed(input_str):
+    rules, updates = parse_input(input_str)
+    successors = build_rule_index(rules)
+    middle_sum = 0
+    incorrect_sum = 0
+    for update in updates:
+        if is_update_valid_indexed(update, successors):
+            middle_sum += update[len(update) // 2]
+        else:
+            fixed = reorganize_indexed(update, successors)
+            incorrect_sum += fixed[len(fixed) // 2]
+    return middle_sum, incorrect_sum
+
+
+class PageOrderingService:
+    """
+    Keep the rule index and per-update results between calls so batches of updates can be
+    validated and fixed without rebuilding anything. Rule sets from the puzzle input are usually
+    cyclic as a whole and only acyclic within each update, so cycles are only looked for among
+    the pages of a single update: for cached updates when a rule is added, and for any other
+    update when it cannot be ordered.
+    """
+
+    def __init__(self, rules=()):
+        self.successors = build_rule_index(rules)
+        self.cache = {}  # tuple(update) -> (is valid, fixed update)
+        self.keys_by_page = defaultdict(set)  # page -> cached updates containing it
+
+    def reaches(self, start, target, pages):
+        # Only follows rules between the given pages
+        stack = [start]
+        seen = {start}
+        while stack:
+            page = stack.pop()
+            if page == target:
+                return True
+            for successor in self.successors.get(page, NO_PAGES) & pages:
+                if successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
+
+    def affected_keys(self, A, B):
+        # Only updates containing both pages of a rule can change their result
+        return self.keys_by_page.get(A, NO_PAGES) & self.keys_by_page.get(B, NO_PAGES)
+
+    def invalidate(self, A, B):
+        for key in self.affected_keys(A, B):
+            del self.cache[key]
+            for page in key:
+                self.keys_by_page[page].discard(key)
+
+    def add_rule(self, A, B, check_cycles=True):
+        if B in self.successors.get(A, NO_PAGES):
+            return
+        if check_cycles:
+            for key in self.affected_keys(A, B):
+                if self.reaches(B, A, set(key)):
+                    raise ValueError(f"Rule {A}|{B} would create a cycle among the pages of update {list(key)}")
+        self.successors[A].add(B)
+        self.invalidate(A, B)
+
+    def remove_rule(self, A, B):
+        if B not in self.successors.get(A, NO_PAGES):
+            return
+        self.successors[A].discard(B)
+        self.invalidate(A, B)
+
+    def check(self, update):
+        key = tuple(update)
+        if key not in self.cache:
+            if is_update_valid_indexed(key, self.successors):
+                self.cache[key] = (True, key)
+            else:
+                fixed = reorganize_indexed(key, self.successors)
+                if len(fixed) < len(key):
+                    raise ValueError(f"Rules form a cycle among the pages of update {list(key)}")
+                self.cache[key] = (False, tuple(fixed))
+            for page in key:
+                self.keys_by_page[page].add(key)
+        return self.cache[key]
+
+    def check_batch(self, updates):
+        return [self.check(update) for update in updates]
+
+    def middle_sums(self, updates):
+        middle_sum = 0
+        incorrect_sum = 0
+        for valid, fixed in self.check_batch(updates):
+            if valid:
+                middle_sum += fixed[len(fixed) // 2]
+            else:
+                incorrect_sum += fixed[len(fixed) // 2]
+        return middle_sum, incorrect_sum
+
+
 if __name__ == '__main__':
     print(calculate_middle_sum('example_1.txt'))
 
     print(calculate_middle_sum('input.txt'))
+
+    print(calculate_middle_sum_indexed('input.txt'))
+
+    rules, updates = parse_input('input.txt')
+    service = PageOrderingService(rules)
+    print(service.middle_sums(updates))
@@ -1,3 +1,9 @@
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # Up, Right, Down, Left
+
+
 def load_grid_from_file(filename):
     """Load grid data from a file."""
     with open(filename, 'r') as file:
@@ -107,6 +113,198 @@ def create_loop(start_pos, obstacles, grid):
     return False
 
 
+def build_obstacle_index(obstacles, rows, cols):
+    """
+    Build the jump table used to move the guard straight to the next wall.
+
+    Args:
+        obstacles: Obstacle positions in the grid.
+        rows: Number of grid rows.
+        cols: Number of grid columns.
+
+    Returns:
+        A tuple of (obstacles_by_row, obstacles_by_col) holding sorted column and row indices.
+    """
+    obstacles_by_row = [[] for _ in range(rows)]
+    obstacles_by_col = [[] for _ in range(cols)]
+    for r, c in sorted(obstacles):
+        obstacles_by_row[r].append(c)
+        obstacles_by_col[c].append(r)
+    return obstacles_by_row, obstacles_by_col
+
+
+def find_next_obstacle(obstacle_index, position, direction):
+    """
+    Find the first obstacle in front of the guard.
+
+    Args:
+        obstacle_index: The jump table from build_obstacle_index.
+        position: The current guard position.
+        direction: Index into DIRECTIONS of the current heading.
+
+    Returns:
+        The obstacle position, or None if the guard walks off the grid.
+    """
+    obstacles_by_row, obstacles_by_col = obstacle_index
+    r, c = position
+    if direction == 0:
+        line = obstacles_by_col[c]
+        i = bisect_left(line, r)
+        return (line[i - 1], c) if i else None
+    if direction == 1:
+        line = obstacles_by_row[r]
+        i = bisect_right(line, c)
+        return (r, line[i]) if i < len(line) else None
+    if direction == 2:
+        line = obstacles_by_col[c]
+        i = bisect_right(line, r)
+        return (line[i], c) if i < len(line) else None
+    line = obstacles_by_row[r]
+    i = bisect_left(line, c)
+    return (r, line[i - 1]) if i else None
+
+
+def walk_segment(obstacle, position, direction, rows, cols):
+    """Return the last cell the guard stands on before the obstacle or the grid edge."""
+    dr, dc = DIRECTIONS[direction]
+    if obstacle is not None:
+        return obstacle[0] - dr, obstacle[1] - dc
+    r, c = position
+    return (r if dr == 0 else (rows - 1 if dr > 0 else 0)), (c if dc == 0 else (cols - 1 if dc > 0 else 0))
+
+
+def find_distinct_pos_fast(start_pos, obstacles, grid):
+    """
+    Simulate the guard by jumping from wall to wall instead of stepping cell by cell.
+
+    Args:
+        start_pos: The start positions found in the grid.
+        obstacles: Existing obstacles in the grid.
+        grid: The 2D grid.
+
+    Returns:
+        A tuple of (distinct_pos, visited) where visited is a flat bitmap of row * cols + col.
+    """
+    rows, cols = len(grid), len(grid[0])
+    obstacle_index = build_obstacle_index(obstacles, rows, cols)
+    visited = bytearray(rows * cols)
+    distinct_pos = 0
+    position, direction = start_pos[0], 0
+
+    while True:
+        obstacle = find_next_obstacle(obstacle_index, position, direction)
+        end = walk_segment(obstacle, position, direction, rows, cols)
+        # Mark the whole segment with one slice, walking it from its lower flat index
+        first, last = sorted((position[0] * cols + position[1], end[0] * cols + end[1]))
+        step = cols if direction in (0, 2) else 1
+        segment = visited[first:last + 1:step]
+        distinct_pos += len(segment) - segment.count(1)
+        visited[first:last + 1:step] = b'\x01' * len(segment)
+        if obstacle is None:
+            return distinct_pos, visited
+        position, direction = end, (direction + 1) % 4
+
+
+def find_next_obstacle_with(obstacle_index, position, direction, extra):
+    """Find the first obstacle in front of the guard with one extra obstacle patched in."""
+    obstacle = find_next_obstacle(obstacle_index, position, direction)
+    (r, c), (er, ec) = position, extra
+    dr, dc = DIRECTIONS[direction]
+    ahead = er == r and (ec - c) * dc > 0 if dr == 0 else ec == c and (er - r) * dr > 0
+    if ahead and (obstacle is None or abs(er - r) + abs(ec - c) < abs(obstacle[0] - r) + abs(obstacle[1] - c)):
+        return extra
+    return obstacle
+
+
+def is_loop(obstacle_index, position, direction, extra):
+    """
+    Check whether the guard loops from the given state with an extra obstacle.
+
+    Args:
+        obstacle_index: The jump table from build_obstacle_index.
+        position: The guard position to start from.
+        direction: Index into DIRECTIONS of the starting heading.
+        extra: The position of the added obstruction.
+
+    Returns:
+        True if the guard hits the same obstacle from the same direction twice.
+    """
+    seen = set()
+    while True:
+        obstacle = find_next_obstacle_with(obstacle_index, position, direction, extra)
+        if obstacle is None:
+            return False
+        if (obstacle, direction) in seen:
+            return True
+        seen.add((obstacle, direction))
+        position = obstacle[0] - DIRECTIONS[direction][0], obstacle[1] - DIRECTIONS[direction][1]
+        direction = (direction + 1) % 4
+
+
+def find_obstruction_candidates(start_pos, obstacle_index, grid):
+    """
+    Walk the original path and record, for every cell where an obstruction could go,
+    the guard state just before it first steps onto that cell.
+
+    Returns:
+        A list of (cell, position, direction) tuples in path order.
+    """
+    rows, cols = len(grid), len(grid[0])
+    visited = bytearray(rows * cols)
+    candidates = []
+    position, direction = start_pos[0], 0
+    visited[position[0] * cols + position[1]] = 1
+
+    while True:
+        obstacle = find_next_obstacle(obstacle_index, position, direction)
+        end = walk_segment(obstacle, position, direction, rows, cols)
+        dr, dc = DIRECTIONS[direction]
+        for _ in range(abs(end[0] - position[0]) + abs(end[1] - position[1])):
+            cell = (position[0] + dr, position[1] + dc)
+            if not visited[cell[0] * cols + cell[1]]:
+                visited[cell[0] * cols + cell[1]] = 1
+                if grid[cell[0]][cell[1]] == '.':
+                    candidates.append((cell, position, direction))
+            position = cell
+        if obstacle is None:
+            return candidates
+        direction = (direction + 1) % 4
+
+
+worker_obstacle_index = None
+
+
+def init_loop_worker(obstacle_index):
+    global worker_obstacle_index
+    worker_obstacle_index = obstacle_index
+
+
+def count_loops_in_chunk(candidates):
+    return sum(is_loop(worker_obstacle_index, position, direction, cell) for cell, position, direction in candidates)
+
+
+def count_loop_obstructions(start_pos, obstacles, grid, workers=None, chunk_size=256):
+    """
+    Count obstruction positions that create a loop, trying the candidates in a process pool.
+
+    Args:
+        start_pos: The start positions found in the grid.
+        obstacles: Existing obstacles in the grid.
+        grid: The 2D grid.
+        workers: Number of worker processes, defaults to the CPU count.
+        chunk_size: Number of candidates handed to a worker at once.
+
+    Returns:
+        The number of obstruction options.
+    """
+    obstacle_index = build_obstacle_index(obstacles, len(grid), len(grid[0]))
+    candidates = find_obstruction_candidates(start_pos, obstacle_index, grid)
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_loop_worker,
+                             initargs=(obstacle_index,)) as executor:
+        return sum(executor.map(count_loops_in_chunk, chunks))
+
+
 if __name__ == '__main__':
     grid = load_grid_from_file('example_1.txt')
     start_pos, obstacles = find_start_pos_obstacles(grid)
@@ -115,6 +313,7 @@ if __name__ == '__main__':
     grid = load_grid_from_file('input.txt')
     start_pos, obstacles = find_start_pos_obstacles(grid)
     print(find_distinct_pos(start_pos, obstacles, grid)[0])
+    print(find_distinct_pos_fast(start_pos, obstacles, grid)[0])
 
     grid = load_grid_from_file('example_1.txt')
     start_pos, obstacles = find_start_pos_obstacles(grid)
@@ -125,3 +324,4 @@ if __name__ == '__main__':
     start_pos, obstacles = find_start_pos_obstacles(grid)
     visited = find_distinct_pos(start_pos, obstacles, grid)[1]
     print(add_obstruction(start_pos, obstacles, grid, visited))
+    print(count_loop_obstructions(start_pos, obstacles, grid))
@@ -1,3 +1,7 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+
 def parse_input(file_path):
     with open(file_path, 'r') as file:
         data = []
@@ -40,6 +44,118 @@ def helper_2(result, values, index, current_sum):
             helper_2(result, values, index + 1, int(str(current_sum) + str(values[index]))))
 
 
+def next_power_of_ten(value):
+    power = 10
+    while power <= value:
+        power *= 10
+    return power
+
+
+def solve_backwards(result, values, index, concatenation):
+    # Undo the last operator: values are non-negative, so partial results never exceed the target
+    if index == 0:
+        return result == values[0]
+    value = values[index]
+    if value == 0 and result == 0:
+        return True  # Multiplying any prefix by zero reaches zero
+    if value != 0 and result % value == 0 and solve_backwards(result // value, values, index - 1, concatenation):
+        return True
+    if concatenation:
+        power = next_power_of_ten(value)
+        if result % power == value and solve_backwards(result // power, values, index - 1, concatenation):
+            return True
+    return result >= value and solve_backwards(result - value, values, index - 1, concatenation)
+
+
+def check_equation_backwards(data, concatenation=False):
+    correct_sum = 0
+    for result, values in data:
+        if solve_backwards(result, values, len(values) - 1, concatenation):
+            correct_sum += result
+    return correct_sum
+
+
+# Returned by an inverse when every prefix result works, e.g. multiplying by zero to reach zero
+ANY_PREFIX = 'any'
+
+
+def add(a, b):
+    return a + b
+
+
+def unadd(result, value):
+    return result - value if result >= value else None
+
+
+def multiply(a, b):
+    return a * b
+
+
+def unmultiply(result, value):
+    if value == 0:
+        return ANY_PREFIX if result == 0 else None
+    return result // value if result % value == 0 else None
+
+
+def concatenate(a, b):
+    return a * next_power_of_ten(b) + b
+
+
+def unconcatenate(result, value):
+    power = next_power_of_ten(value)
+    return result // power if result % power == value else None
+
+
+# Operator name -> (forward, inverse); the inverse undoes the operator or returns None if it cannot
+OPERATORS = {'*': (multiply, unmultiply), '+': (add, unadd)}
+OPERATORS_WITH_CONCATENATION = {'||': (concatenate, unconcatenate), **OPERATORS}
+
+
+def find_operators(result, values, index, operators):
+    if index == 0:
+        return [] if result == values[0] else None
+    for name, (_, inverse) in operators.items():
+        prefix = inverse(result, values[index])
+        if prefix == ANY_PREFIX:
+            return [next(iter(operators))] * (index - 1) + [name]
+        if prefix is not None:
+            found = find_operators(prefix, values, index - 1, operators)
+            if found is not None:
+                return found + [name]
+    return None
+
+
+def evaluate_operators(values, names, operators):
+    current = values[0]
+    for value, name in zip(values[1:], names):
+        current = operators[name][0](current, value)
+    return current
+
+
+def solve_equation(equation, operators):
+    result, values = equation
+    names = find_operators(result, values, len(values) - 1, operators)
+    # Replay the sequence with the forward functions so a wrong inverse cannot report a false match
+    if names is not None and evaluate_operators(values, names, operators) != result:
+        raise ValueError(f"Operators {names} found by the inverses do not produce {result} from {values}")
+    return result, values, names
+
+
+def calibrate(data, operators, workers=None, chunk_size=64):
+    """
+    Solve every equation from parse_input with the given operator set in a process pool.
+    Operators must be module-level functions so they can be sent to the workers.
+
+    Returns:
+    tuple: (results, total) where results holds (result, values, operator names or None)
+    per equation and total is the sum of the solvable results.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(solve_equation, data, repeat(operators), chunksize=chunk_size))
+    total = sum(result for result, _, names in results if names is not None)
+    return results, total
+
+
 if __name__ == '__main__':
     data = parse_input('example_1.txt')
     print(check_equation(data))
@@ -52,3 +168,9 @@ if __name__ == '__main__':
 
     data = parse_input('input.txt')
     print(check_equation_2(data))
+
+    print(check_equation_backwards(data))
+    print(check_equation_backwards(data, concatenation=True))
+
+    print(calibrate(data, OPERATORS)[1])
+    print(calibrate(data, OPERATORS_WITH_CONCATENATION)[1])
@@ -1,3 +1,9 @@
+import re
+from math import gcd
+
+ANTENNA_PATTERN = re.compile(r"[^.]")
+
+
 def load_grid_from_file(filename):
     """Load grid data from a file into a 2D list."""
     with open(filename, 'r') as file:
@@ -108,8 +114,90 @@ def process_file(filename, extended=False):
     return calculate_antinodes(grid, antennas_to_check)
 
 
+def stream_antennas(filename):
+    """
+    Read antenna positions line by line without keeping the grid in memory.
+
+    Returns:
+        tuple: (antennas, rows, cols) where antennas maps labels to lists of positions.
+    """
+    antennas = {}
+    rows, cols = 0, 0
+    with open(filename, 'r') as file:
+        for i, line in enumerate(file):
+            line = line.strip()
+            if not line:
+                continue
+            rows, cols = i + 1, len(line)
+            for match in ANTENNA_PATTERN.finditer(line):
+                antennas.setdefault(match.group(), []).append((i, match.start()))
+    return antennas, rows, cols
+
+
+def multiple_range(start, step, size):
+    """
+    Return the range of t for which start + t * step stays within [0, size).
+
+    Returns:
+        tuple: (low, high) inclusive bounds, empty when low > high.
+    """
+    if step == 0:
+        return (float('-inf'), float('inf')) if 0 <= start < size else (1, 0)
+    if step > 0:
+        return -(start // step), (size - 1 - start) // step
+    return -((size - 1 - start) // -step), start // -step
+
+
+def mark_antinode(bitmap, index):
+    """Set a bit in the antinode bitmap and return 1 if it was not set before."""
+    byte, bit = index >> 3, 1 << (index & 7)
+    if bitmap[byte] & bit:
+        return 0
+    bitmap[byte] |= bit
+    return 1
+
+
+def count_antinodes_sparse(filename, extended=False):
+    """
+    Count antinodes from antenna coordinates only, marking them in a bit-packed bitmap.
+    For extended antinodes each pair's offset is reduced by its gcd and the in-bounds
+    range of multiples is computed directly instead of walking the line.
+
+    Args:
+        filename (str): The file path.
+        extended (bool): Whether to calculate extended antinodes.
+
+    Returns:
+        int: Count of antinodes.
+    """
+    antennas, rows, cols = stream_antennas(filename)
+    bitmap = bytearray((rows * cols + 7) // 8)
+    count = 0
+
+    for positions in antennas.values():
+        for i, (r1, c1) in enumerate(positions):
+            for r2, c2 in positions[i + 1:]:
+                dx, dy = r2 - r1, c2 - c1
+                if not extended:
+                    for r, c in ((r1 - dx, c1 - dy), (r2 + dx, c2 + dy)):
+                        if 0 <= r < rows and 0 <= c < cols:
+                            count += mark_antinode(bitmap, r * cols + c)
+                    continue
+                divisor = gcd(dx, dy)
+                dx, dy = dx // divisor, dy // divisor
+                low_r, high_r = multiple_range(r1, dx, rows)
+                low_c, high_c = multiple_range(c1, dy, cols)
+                low, high = max(low_r, low_c), min(high_r, high_c)
+                base, stride = r1 * cols + c1, dx * cols + dy
+                for t in range(low, high + 1):
+                    count += mark_antinode(bitmap, base + t * stride)
+    return count
+
+
 if __name__ == '__main__':
     files = ['example_1.txt', 'input.txt', 'example_2.txt']
     for file in files:
         print(f"File: {file}, Antinodes: {process_file(file)}")
         print(f"File: {file}, Extended Antinodes: {process_file(file, extended=True)}")
+        print(f"File: {file}, Sparse Antinodes: {count_antinodes_sparse(file)}, "
+              f"{count_antinodes_sparse(file, extended=True)}")
@@ -1,3 +1,4 @@
+import heapq
 import time
 
 
@@ -118,6 +119,83 @@ def calculate_checksum(data):
     return sum(idx * val for idx, val in enumerate(data) if val != '.')
 
 
+def parse_disk_map(file_path):
+    """Parse input from a file into run lengths, alternating file and free space."""
+    with open(file_path, 'r') as file:
+        return list(map(int, file.read().rstrip()))
+
+
+def run_checksum(file_id, position, length):
+    """Checksum of a file run occupying length blocks from position."""
+    return file_id * (length * position + length * (length - 1) // 2)
+
+
+def compact_checksum(disk_map):
+    """Compact blocks with two pointers over the run lengths and return the checksum."""
+    lengths = disk_map[:]
+    left, right = 0, len(lengths) - 1
+    if right % 2:
+        right -= 1  # The map may end with free space
+    position = 0
+    checksum = 0
+
+    while left <= right:
+        if left % 2 == 0:
+            # File runs on the left stay in place
+            checksum += run_checksum(left // 2, position, lengths[left])
+            position += lengths[left]
+        else:
+            # Fill the free run from the rightmost files
+            free = lengths[left]
+            while free and left < right:
+                moved = min(free, lengths[right])
+                checksum += run_checksum(right // 2, position, moved)
+                position += moved
+                free -= moved
+                lengths[right] -= moved
+                if lengths[right] == 0:
+                    right -= 2
+        left += 1
+    return checksum
+
+
+def compact_files_checksum(disk_map):
+    """
+    Move whole files using one min-heap of free span starts per span size
+    and return the checksum computed from the final file positions.
+    """
+    files = []
+    free_spaces = []
+    position = 0
+    for idx, length in enumerate(disk_map):
+        if idx % 2 == 0:
+            files.append((position, length))
+        elif free_spaces and sum(free_spaces[-1]) == position:
+            free_spaces[-1] = (free_spaces[-1][0], free_spaces[-1][1] + length)  # Around an empty file
+        elif length:
+            free_spaces.append((position, length))
+        position += length
+
+    heaps = [[] for _ in range(max((length for _, length in free_spaces), default=0) + 1)]
+    for start, length in free_spaces:
+        heaps[length].append(start)  # Starts grow, so every list is already a heap
+
+    checksum = 0
+    for file_id in range(len(files) - 1, -1, -1):
+        start, length = files[file_id]
+        # The leftmost span that fits is the smallest top among the heaps of large enough spans
+        best_size = None
+        for size in range(length, len(heaps)):
+            if heaps[size] and heaps[size][0] < start and (best_size is None or heaps[size][0] < heaps[best_size][0]):
+                best_size = size
+        if best_size is not None:
+            start = heapq.heappop(heaps[best_size])
+            if best_size > length:
+                heapq.heappush(heaps[best_size - length], start + length)
+        checksum += run_checksum(file_id, start, length)
+    return checksum
+
+
 def time_function(func, *args):
     """Decorator to time a function call."""
     start_time = time.time()
@@ -144,6 +222,13 @@ if __name__ == '__main__':
     compact_data = time_function(compact, data)
     print(f"Checksum: {calculate_checksum(compact_data)}")
 
+    print("\nProcessing input.txt with run-length compaction")
+    disk_map = parse_disk_map('input.txt')
+    print(f"Checksum: {time_function(compact_checksum, disk_map)}")
+
+    print("\nProcessing input.txt with heap-based extended compaction")
+    print(f"Checksum: {time_function(compact_files_checksum, disk_map)}")
+
     print("\nProcessing example_1.txt with extended compaction")
     data = parse_input('example_1.txt')
     compact_data = time_function(compact_extended, data)